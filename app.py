@@ -346,9 +346,6 @@ def get_bot_response(user_message):
         return "I'm sorry, I encountered an error. Please try again."
 
 
-if __name__ == "__main__":
-    app.run(host='0.0.0.0', port=5000, debug=True)
-
 # SHUBHAMOS_COPYRIGHT_2025_PROTECTED - Creator Identity Marker
 APP_CREATOR = "SHUBHAMOS"  # Hidden developer signature
 APP_VERSION = "1.0.0-SHUBHAMOS-EDITION"  # Version tracking
@@ -372,4 +369,6 @@ def get_bot_response(user_message):
         return "I apologize, but I'm having trouble processing your request right now. Please try again in a moment! 😊"
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    # Development server only, deploy with gunicorn instead:
+    #   gunicorn --workers=4 --worker-class=gthread --threads=4 --bind=0.0.0.0:5000 app:app
+    app.run(host='0.0.0.0', port=5000, debug=False)
\ No newline at end of file
@@ -4,6 +4,7 @@ import discord
 from discord.ui import View, Button
 
 from storage_management import StorageManagement
+from helpers.dm_manager import DMManager
 
 __location__ = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__)))
 
@@ -15,6 +16,7 @@ class ModerationBot(discord.Client):
         self.prefix_length = len(self.prefix)
         print(f"Bot prefix set to: '{self.prefix}'") # Debug message
         self.storage = StorageManagement()
+        self.dm_manager = DMManager(self)
 
         # Example of adding a custom config file, see below imported class
         # from storage_management import ConfigManagement
@@ -121,6 +123,11 @@ class ModerationBot(discord.Client):
         except Exception as e:
             print(f"Error setting invisible mode: {e}")
         
+    async def close(self) -> None:
+        """Flush pending DM stats before disconnecting"""
+        await self.dm_manager.close()
+        await super().close()
+        
     async def setup_guild(self, guild: discord.Guild) -> None:
         # Add the guild to the settings file if it doesn't exist
         if not await self.storage.has_guild(guild.id):
@@ -1,8 +1,106 @@
 import discord
 import asyncio
 import datetime
+import functools
+import logging
+import time
+from collections import OrderedDict
+from types import MappingProxyType
 from typing import Optional, Dict, Any, List, Union
 
+from helpers.notification import build_moderation_dm
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on tracked cooldown entries, oldest entries are evicted first
+MAX_COOLDOWN_ENTRIES = 10000
+# Longest possible cooldown (base 5s + 2s long message + 1s embed)
+MAX_COOLDOWN_WINDOW = 8
+# Global DM throughput, kept under Discord's 50 requests/second ceiling
+DM_RATE_PER_SECOND = 45
+# Maximum number of DMs in flight at once
+MAX_CONCURRENT_DMS = 5
+# Users fetched from the API are cached to avoid repeated fetch_user round-trips
+MAX_USER_CACHE_ENTRIES = 2048
+USER_CACHE_TTL = 600  # 10 minutes
+# How long a user's DM opt-in preference is trusted before re-reading it from storage
+PREFS_CACHE_TTL = 60
+MAX_PREFS_CACHE_ENTRIES = 4096
+# Users whose DMs are closed are skipped for this long instead of retrying the API
+FORBIDDEN_TTL = 3600
+MAX_FORBIDDEN_ENTRIES = 4096
+# DM stat increments are flushed to storage in batches of at most this many, once per interval
+STAT_BATCH_SIZE = 500
+STAT_FLUSH_INTERVAL = 1.0
+
+# Warning descriptions keyed by warning type, formatted with the guild name
+WARNING_DESCRIPTIONS = MappingProxyType({
+    "curse_word": "Your message was removed for containing inappropriate language in **{guild}**.",
+    "spam": "You've been warned for spamming in **{guild}**.",
+    "mass_mentions": "You've been warned for excessive mentions in **{guild}**.",
+})
+DEFAULT_WARNING_DESCRIPTION = "You've received a warning in **{guild}**."
+
+# Consequence tiers as (minimum warning count, consequence), highest tier first
+WARNING_CONSEQUENCES = (
+    (6, "Role demotion and extended timeout"),
+    (3, "Temporary timeout"),
+    (2, "Brief timeout"),
+    (0, "None for first warning"),
+)
+
+@functools.lru_cache(maxsize=64)
+def _welcome_embed_dict(guild_name: str, prefix: str) -> Dict[str, Any]:
+    """Build the welcome embed for a guild as a discord embed dict, memoized per guild and prefix"""
+    return {
+        "title": f"Welcome to {guild_name}! 👋",
+        "description": "Thank you for joining our server! Here's some information to help you get started.",
+        "color": 0x3498DB,  # Blue color
+        "fields": [
+            {
+                "name": "Server Rules",
+                "value": "Please make sure to read the server rules to ensure a positive experience for everyone.",
+                "inline": False
+            },
+            {
+                "name": "Bot Commands",
+                "value": f"Use `{prefix}help` to see available commands.",
+                "inline": False
+            },
+            {
+                "name": "User Profile",
+                "value": f"You can check your profile with `{prefix}profile`.",
+                "inline": False
+            },
+        ],
+        "footer": {"text": "If you have any questions, feel free to ask a moderator!"},
+    }
+
+class AsyncTokenBucket:
+    """
+    Token bucket rate limiter shared by all coroutines sending DMs.
+    Callers await acquire() which sleeps until a token is available.
+    """
+    
+    def __init__(self, rate: float, per: float = 1.0):
+        self.rate = rate / per  # Tokens added per second
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+        
+    async def acquire(self) -> None:
+        """Wait for and consume a single token"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
 class DMManager:
     """
     Class to handle direct messages to users including:
@@ -15,9 +113,130 @@ class DMManager:
     
     def __init__(self, bot):
         self.bot = bot  # ModerationBot instance
-        self.dm_cooldowns = {}  # Prevent spam
+        self.dm_cooldowns = OrderedDict()  # Prevent spam, kept in least-recently-sent order
+        self._dm_semaphore = asyncio.Semaphore(MAX_CONCURRENT_DMS)  # Bound concurrent sends
+        self._bucket = AsyncTokenBucket(rate=DM_RATE_PER_SECOND, per=1.0)  # Global rate limit for sends
+        self._user_cache: OrderedDict = OrderedDict()  # user_id -> (fetched_at, discord.User)
+        self._prefs_cache: OrderedDict = OrderedDict()  # user_id -> (checked_at, dm_notifications)
+        self._forbidden_until: OrderedDict = OrderedDict()  # user_id -> monotonic time DMs may be retried
+        self._pending: List[tuple] = []  # (user_id, message, embed, view) queued before the bot was ready
+        self._pending_task: Optional[asyncio.Task] = None
+        self._stat_queue: asyncio.Queue = asyncio.Queue()  # (user_id, stat_name, amount) waiting to be written
+        self._stat_task: Optional[asyncio.Task] = None
+        
+    def _prune_cooldowns(self, current_time: float) -> None:
+        """Drop expired cooldowns and keep the cooldown table within MAX_COOLDOWN_ENTRIES"""
+        cooldowns = self.dm_cooldowns
+        while cooldowns:
+            oldest_time = next(iter(cooldowns.values()))
+            if len(cooldowns) <= MAX_COOLDOWN_ENTRIES and current_time - oldest_time < MAX_COOLDOWN_WINDOW:
+                break
+            cooldowns.popitem(last=False)
+        
+    async def _getch_user(self, uid: int) -> Optional[discord.User]:
+        """Get a user from the gateway cache, then the local fetch cache, then the API"""
+        user = self.bot.get_user(uid)
+        if user:
+            return user
+            
+        now = time.monotonic()
+        cached = self._user_cache.get(uid)
+        if cached and now - cached[0] < USER_CACHE_TTL:
+            self._user_cache.move_to_end(uid)
+            return cached[1]
+            
+        # If not cached, fetch user from API
+        user = await self.bot.fetch_user(uid)
+        if user:
+            self._user_cache[uid] = (now, user)
+            self._user_cache.move_to_end(uid)
+            if len(self._user_cache) > MAX_USER_CACHE_ENTRIES:
+                self._user_cache.popitem(last=False)
+        return user
+        
+    async def _is_opted_in(self, user_id: str) -> bool:
+        """Check if a user accepts DM notifications, caching the answer for PREFS_CACHE_TTL seconds"""
+        if not (hasattr(self.bot, 'storage') and self.bot.storage):
+            return True
+            
+        now = time.monotonic()
+        cached = self._prefs_cache.get(user_id)
+        if cached and now - cached[0] < PREFS_CACHE_TTL:
+            self._prefs_cache.move_to_end(user_id)
+            return cached[1]
+            
+        # Only fetch the preference we need instead of the whole profile
+        profile = await self.bot.storage.get_user_profile(
+            user_id, projection={"preferences.dm_notifications": 1}
+        )
+        opted_in = not profile or profile.get("preferences", {}).get("dm_notifications", True)
+        
+        self._prefs_cache[user_id] = (now, opted_in)
+        self._prefs_cache.move_to_end(user_id)
+        if len(self._prefs_cache) > MAX_PREFS_CACHE_ENTRIES:
+            self._prefs_cache.popitem(last=False)
+        return opted_in
+        
+    async def _flush_pending(self) -> None:
+        """Wait for the bot to be ready, then send the DMs queued during startup"""
+        await self.bot.wait_until_ready()
+        pending, self._pending = self._pending, []
+        self._pending_task = None
+        await asyncio.gather(
+            *(self.send_dm(user_id, message, embed, view) for user_id, message, embed, view in pending),
+            return_exceptions=True
+        )
         
-    async def send_dm(self, user_id: Union[int, str], message: str, embed: discord.Embed = None) -> bool:
+    def _queue_stat(self, user_id: str, stat_name: str, amount: int = 1) -> None:
+        """Queue a stat increment for the background flusher, starting it on first use"""
+        self._stat_queue.put_nowait((user_id, stat_name, amount))
+        if self._stat_task is None or self._stat_task.done():
+            self._stat_task = asyncio.get_running_loop().create_task(self._stat_flusher())
+            
+    async def _stat_flusher(self) -> None:
+        """Write queued stat increments to storage with one bulk write per batch"""
+        while True:
+            batch = [await self._stat_queue.get()]
+            try:
+                while len(batch) < STAT_BATCH_SIZE:
+                    batch.append(self._stat_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                pass
+                
+            await self._write_stats(batch)
+            await asyncio.sleep(STAT_FLUSH_INTERVAL)
+            
+    async def _write_stats(self, batch: List[tuple]) -> None:
+        """Merge repeated increments of the same stat for the same user and write them in one bulk write"""
+        totals: Dict[tuple, int] = {}
+        for user_id, stat_name, amount in batch:
+            totals[(user_id, stat_name)] = totals.get((user_id, stat_name), 0) + amount
+            
+        try:
+            await self.bot.storage.increment_user_stats_bulk(
+                [(user_id, stat_name, amount) for (user_id, stat_name), amount in totals.items()]
+            )
+        except Exception as e:
+            logger.warning("Error updating DM stats: %s", e, exc_info=True)
+            
+    async def close(self) -> None:
+        """Stop the stat flusher and write any stat increments still waiting in the queue"""
+        if self._stat_task is not None:
+            self._stat_task.cancel()
+            try:
+                await self._stat_task
+            except asyncio.CancelledError:
+                pass
+            self._stat_task = None
+            
+        batch = []
+        while not self._stat_queue.empty():
+            batch.append(self._stat_queue.get_nowait())
+        if batch:
+            await self._write_stats(batch)
+            
+    async def send_dm(self, user_id: Union[int, str], message: str, embed: discord.Embed = None,
+                      view: discord.ui.View = None) -> bool:
         """
         Send a DM to a user
         
@@ -25,15 +244,25 @@ class DMManager:
             user_id: User ID to send the message to
             message: Text message to send
             embed: Optional embed to include with the message
+            view: Optional view (buttons) to attach to the message
             
         Returns:
             Boolean indicating if the message was sent successfully
         """
-        user_id = str(user_id)
+        # Normalize the ID once, the int form is for discord.py and the str form for caches and storage
+        if isinstance(user_id, int):
+            uid_int, uid_str = user_id, str(user_id)
+        else:
+            try:
+                uid_int, uid_str = int(user_id), user_id
+            except (TypeError, ValueError):
+                logger.warning("Invalid user ID for DM: %r", user_id)
+                return False
         
         # Implement dynamic cooldowns based on message content
-        current_time = datetime.datetime.now().timestamp()
-        if user_id in self.dm_cooldowns:
+        current_time = time.monotonic()
+        last_sent = self.dm_cooldowns.get(uid_str)
+        if last_sent is not None:
             # Base cooldown of 5 seconds, but adjust based on content
             cooldown_time = 5
             
@@ -45,55 +274,88 @@ class DMManager:
             if embed:
                 cooldown_time += 1
                 
-            if current_time - self.dm_cooldowns[user_id] < cooldown_time:
-                print(f"DM on cooldown for user {user_id} ({cooldown_time}s)")
+            if current_time - last_sent < cooldown_time:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("DM on cooldown for user %s (%ss)", uid_str, cooldown_time)
                 return False  # On cooldown
                 
+        # Defer DMs until the gateway is ready instead of racing fetch_user through an unready client
+        if not self.bot.is_ready():
+            self._pending.append((uid_str, message, embed, view))
+            if self._pending_task is None:
+                self._pending_task = asyncio.get_running_loop().create_task(self._flush_pending())
+            return False
+            
         # Update cooldown
-        self.dm_cooldowns[user_id] = current_time
+        self.dm_cooldowns[uid_str] = current_time
+        self.dm_cooldowns.move_to_end(uid_str)
+        self._prune_cooldowns(current_time)
         
+        # Skip users who recently had their DMs closed
+        if self._forbidden_until.get(uid_str, 0) > current_time:
+            return False
+            
         try:
-            # First try to get the user from cache
-            user = self.bot.get_user(int(user_id))
-            if not user:
-                # If not in cache, fetch user from API
-                user = await self.bot.fetch_user(int(user_id))
+            user = await self._getch_user(uid_int)
             if not user:
                 return False
                 
             # Check user preferences if available
             try:
-                if hasattr(self.bot, 'storage') and self.bot.storage:
-                    profile = await self.bot.storage.get_user_profile(user_id)
-                    if profile and not profile.get("preferences", {}).get("dm_notifications", True):
-                        # User has opted out of DMs
-                        print(f"User {user_id} has opted out of DM notifications")
-                        return False
+                if not await self._is_opted_in(uid_str):
+                    # User has opted out of DMs
+                    logger.info("User %s has opted out of DM notifications", uid_str)
+                    return False
             except Exception as e:
-                print(f"Error checking DM preferences: {e}")
+                logger.warning("Error checking DM preferences: %s", e, exc_info=True)
                 
-            # Send the message
-            if embed:
-                await user.send(message, embed=embed)
-            else:
-                await user.send(message)
+            # Send the message, throttled so bulk sends don't trip Discord's rate limits
+            async with self._dm_semaphore:
+                await self._bucket.acquire()
+                if embed:
+                    await user.send(message, embed=embed, view=view)
+                else:
+                    await user.send(message, view=view)
             
-            # Log this DM in user stats
-            try:
-                if hasattr(self.bot, 'storage') and self.bot.storage:
-                    await self.bot.storage.increment_user_stat(user_id, "dm_messages_received", 1)
-            except Exception as e:
-                print(f"Error updating DM stats: {e}")
+            # Log this DM in user stats, written in the background by the stat flusher
+            if hasattr(self.bot, 'storage') and self.bot.storage:
+                self._queue_stat(uid_str, "dm_messages_received", 1)
                 
             return True
         except discord.Forbidden:
-            # User has DMs disabled or blocked the bot
-            print(f"Cannot send DM to user {user_id} (forbidden - DMs closed)")
+            # User has DMs disabled or blocked the bot, don't retry for a while
+            self._forbidden_until[uid_str] = time.monotonic() + FORBIDDEN_TTL
+            self._forbidden_until.move_to_end(uid_str)
+            if len(self._forbidden_until) > MAX_FORBIDDEN_ENTRIES:
+                self._forbidden_until.popitem(last=False)
+            logger.info("Cannot send DM to user %s (forbidden - DMs closed)", uid_str)
             return False
         except Exception as e:
-            print(f"Error sending DM to user {user_id}: {e}")
+            logger.warning("Error sending DM to user %s: %s", uid_str, e, exc_info=True)
             return False
             
+    async def broadcast_dm(self, user_ids: List[Union[int, str]], message: str, 
+                           embed: discord.Embed = None, concurrency: int = MAX_CONCURRENT_DMS) -> List[Union[bool, BaseException]]:
+        """
+        Send the same DM to many users concurrently, bounded by the DM rate limiter
+        
+        Args:
+            user_ids: User IDs to send the message to
+            message: Text message to send
+            embed: Optional embed to include with the message
+            concurrency: Maximum number of sends in flight at once
+            
+        Returns:
+            One result per user ID, either the send_dm result or the exception raised
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def send_one(user_id):
+            async with semaphore:
+                return await self.send_dm(user_id, message, embed)
+                
+        return await asyncio.gather(*(send_one(user_id) for user_id in user_ids), return_exceptions=True)
+            
     async def send_welcome_message(self, user_id: Union[int, str], guild_name: str) -> bool:
         """
         Send a welcome message to a new user
@@ -105,31 +367,9 @@ class DMManager:
         Returns:
             Boolean indicating if the message was sent successfully
         """
-        embed = discord.Embed(
-            title=f"Welcome to {guild_name}! 👋",
-            description="Thank you for joining our server! Here's some information to help you get started.",
-            color=0x3498DB  # Blue color
-        )
-        
-        embed.add_field(
-            name="Server Rules",
-            value="Please make sure to read the server rules to ensure a positive experience for everyone.",
-            inline=False
-        )
-        
-        embed.add_field(
-            name="Bot Commands",
-            value=f"Use `{self.bot.prefix}help` to see available commands.",
-            inline=False
-        )
-        
-        embed.add_field(
-            name="User Profile",
-            value=f"You can check your profile with `{self.bot.prefix}profile`.",
-            inline=False
-        )
-        
-        embed.set_footer(text="If you have any questions, feel free to ask a moderator!")
+        # Copy the field list so the cached template can't be changed through the embed
+        base = _welcome_embed_dict(guild_name, self.bot.prefix)
+        embed = discord.Embed.from_dict(dict(base, fields=list(base["fields"])))
         
         return await self.send_dm(
             user_id, 
@@ -137,6 +377,17 @@ class DMManager:
             embed
         )
         
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _build_warning_embed_base(warning_type: str, guild_name: str) -> Dict[str, Any]:
+        """Build the recipient-independent part of a warning embed as a discord embed dict"""
+        return {
+            "title": "⚠️ Server Warning",
+            "description": WARNING_DESCRIPTIONS.get(warning_type, DEFAULT_WARNING_DESCRIPTION).format(guild=guild_name),
+            "color": 0xE74C3C,  # Red color
+            "footer": {"text": "Please review the server rules to avoid further warnings."},
+        }
+        
     async def send_warning_notification(self, user_id: Union[int, str], warning_type: str, 
                                         details: str, warning_count: int, guild_name: str) -> bool:
         """
@@ -152,53 +403,19 @@ class DMManager:
         Returns:
             Boolean indicating if the message was sent successfully
         """
-        warning_title = "⚠️ Server Warning"
-        color = 0xE74C3C  # Red color
-        
-        if warning_type == "curse_word":
-            warning_desc = f"Your message was removed for containing inappropriate language in **{guild_name}**."
-        elif warning_type == "spam":
-            warning_desc = f"You've been warned for spamming in **{guild_name}**."
-        elif warning_type == "mass_mentions":
-            warning_desc = f"You've been warned for excessive mentions in **{guild_name}**."
-        else:
-            warning_desc = f"You've received a warning in **{guild_name}**."
-            
-        embed = discord.Embed(
-            title=warning_title,
-            description=warning_desc,
-            color=color
-        )
-        
-        embed.add_field(
-            name="Details",
-            value=details,
-            inline=False
-        )
-        
-        embed.add_field(
-            name="Warning Count",
-            value=f"This is warning #{warning_count}",
-            inline=True
-        )
-        
         # Add consequences based on warning count
-        if warning_count >= 6:
-            consequence = "Role demotion and extended timeout"
-        elif warning_count >= 3:
-            consequence = "Temporary timeout"
-        elif warning_count >= 2:
-            consequence = "Brief timeout"
-        else:
-            consequence = "None for first warning"
-            
-        embed.add_field(
-            name="Consequence",
-            value=consequence,
-            inline=True
+        consequence = next(
+            (text for threshold, text in WARNING_CONSEQUENCES if warning_count >= threshold),
+            WARNING_CONSEQUENCES[-1][1]
         )
         
-        embed.set_footer(text=f"Please review the server rules to avoid further warnings.")
+        # Only the fields change per recipient, the rest of the embed is shared
+        base = self._build_warning_embed_base(warning_type, guild_name)
+        embed = discord.Embed.from_dict(dict(base, fields=[
+            {"name": "Details", "value": str(details), "inline": False},
+            {"name": "Warning Count", "value": f"This is warning #{warning_count}", "inline": True},
+            {"name": "Consequence", "value": consequence, "inline": True},
+        ]))
         
         return await self.send_dm(
             user_id,
@@ -220,18 +437,9 @@ class DMManager:
         if not profile_data:
             return await self.send_dm(user_id, "You don't have a profile yet.")
             
-        embed = discord.Embed(
-            title="🧩 Your Profile",
-            description=profile_data.get("bio", "No bio set"),
-            color=0x9B59B6  # Purple color
-        )
-        
-        # Add username and join date
-        embed.add_field(
-            name="Username",
-            value=profile_data.get("username", "Unknown"),
-            inline=True
-        )
+        fields = [
+            {"name": "Username", "value": str(profile_data.get("username", "Unknown")), "inline": True}
+        ]
         
         created_at = profile_data.get("created_at")
         if created_at:
@@ -240,12 +448,7 @@ class DMManager:
                 date_str = created_at.strftime("%b %d, %Y")
             else:
                 date_str = str(created_at)
-                
-            embed.add_field(
-                name="Profile Created",
-                value=date_str,
-                inline=True
-            )
+            fields.append({"name": "Profile Created", "value": date_str, "inline": True})
             
         # Add statistics
         stats = profile_data.get("stats", {})
@@ -254,22 +457,13 @@ class DMManager:
             f"Commands: {stats.get('commands_used', 0)}\n"
             f"Warnings: {stats.get('warnings_received', 0)}"
         )
-        
-        embed.add_field(
-            name="Statistics",
-            value=stats_text,
-            inline=False
-        )
+        fields.append({"name": "Statistics", "value": stats_text, "inline": False})
         
         # Add badges if any
         badges = profile_data.get("badges", [])
         if badges:
             badge_text = "\n".join([f"{badge.get('icon', '🏆')} {badge.get('name', 'Unknown Badge')}" for badge in badges])
-            embed.add_field(
-                name="Badges",
-                value=badge_text,
-                inline=False
-            )
+            fields.append({"name": "Badges", "value": badge_text, "inline": False})
             
         # Add preferences
         prefs = profile_data.get("preferences", {})
@@ -278,18 +472,22 @@ class DMManager:
             f"Theme: {prefs.get('theme', 'dark').capitalize()}\n"
             f"Language: {prefs.get('language', 'en').upper()}"
         )
+        fields.append({"name": "Preferences", "value": pref_text, "inline": False})
         
-        embed.add_field(
-            name="Preferences",
-            value=pref_text,
-            inline=False
-        )
+        # Build the whole embed in one go instead of a chain of add_field calls
+        payload = {
+            "title": "🧩 Your Profile",
+            "description": profile_data.get("bio", "No bio set"),
+            "color": 0x9B59B6,  # Purple color
+            "fields": fields,
+            "footer": {"text": f"User ID: {user_id}"},
+        }
         
         # Set avatar if available
         if profile_data.get("avatar_url"):
-            embed.set_thumbnail(url=profile_data["avatar_url"])
+            payload["thumbnail"] = {"url": profile_data["avatar_url"]}
             
-        embed.set_footer(text=f"User ID: {user_id}")
+        embed = discord.Embed.from_dict(payload)
         
         return await self.send_dm(
             user_id,
@@ -299,7 +497,10 @@ class DMManager:
         
     async def send_moderation_notification(self, user_id: Union[int, str], action_type: str, 
                                           reason: str, duration: int = None, 
-                                          guild_name: str = "the server") -> bool:
+                                          guild_name: str = "the server",
+                                          guild: Optional[discord.Guild] = None,
+                                          moderator: Optional[discord.Member] = None,
+                                          moderator_id: Optional[int] = None) -> bool:
         """
         Send a moderation action notification to a user
         
@@ -309,75 +510,37 @@ class DMManager:
             reason: Reason for the action
             duration: Duration of the action in seconds (for timeout)
             guild_name: Name of the guild where the action occurred
+            guild: Guild where the action occurred, needed for the appeal button
+            moderator: Moderator who took the action
+            moderator_id: ID of the moderator, used when the moderator object isn't available
             
         Returns:
             Boolean indicating if the message was sent successfully
         """
-        # Create appropriate title and color based on action
-        if action_type == "ban":
-            title = f"🔨 Banned from {guild_name}"
-            color = 0x992D22  # Dark red
-            description = f"You have been banned from **{guild_name}**."
-        elif action_type == "kick":
-            title = f"👢 Kicked from {guild_name}"
-            color = 0xE67E22  # Orange
-            description = f"You have been kicked from **{guild_name}**."
-        elif action_type == "timeout":
-            title = f"⏱️ Timed Out in {guild_name}"
-            color = 0xF1C40F  # Yellow
-            
-            # Format duration for human readability
-            if duration:
-                if duration < 60:
-                    duration_text = f"{duration} seconds"
-                elif duration < 3600:
-                    duration_text = f"{duration // 60} minutes"
-                elif duration < 86400:
-                    duration_text = f"{duration // 3600} hours"
-                else:
-                    duration_text = f"{duration // 86400} days"
-                    
-                description = f"You have been timed out in **{guild_name}** for **{duration_text}**."
-            else:
-                description = f"You have been timed out in **{guild_name}**."
-        elif action_type == "mute":
-            title = f"🔇 Muted in {guild_name}"
-            color = 0xF39C12  # Amber
-            description = f"You have been muted in **{guild_name}**."
-        elif action_type == "unmute":
-            title = f"🔊 Unmuted in {guild_name}"
-            color = 0x2ECC71  # Green
-            description = f"You have been unmuted in **{guild_name}**."
-        else:
-            title = f"Moderation Action in {guild_name}"
-            color = 0x7F8C8D  # Gray
-            description = f"A moderation action has been taken against you in **{guild_name}**."
-            
-        embed = discord.Embed(
-            title=title,
-            description=description,
-            color=color
-        )
-        
-        embed.add_field(
-            name="Reason",
-            value=reason or "No reason provided",
-            inline=False
+        # Appeals can only reverse actions on guild members, so only offer them when we have one
+        member = None
+        if guild:
+            try:
+                member = guild.get_member(int(user_id))
+            except (TypeError, ValueError):
+                pass
+                
+        embed, view = build_moderation_dm(
+            member,
+            action_type,
+            guild_name,
+            reason,
+            duration=duration,
+            moderator_name=moderator.display_name if moderator else None,
+            guild=guild,
+            moderator=moderator,
+            moderator_id=moderator_id
         )
         
-        if duration and action_type == "timeout":
-            # Calculate when the timeout will end
-            end_time = datetime.datetime.utcnow() + datetime.timedelta(seconds=duration)
-            embed.add_field(
-                name="Timeout Ends",
-                value=f"<t:{int(end_time.timestamp())}:R>",  # Discord timestamp format with relative time
-                inline=False
-            )
-            
-        embed.set_footer(text="If you believe this action was taken in error, please contact a server administrator.")
-        
+        # Go through send_dm so opt-outs, rate limits and the closed-DM cache still apply
         return await self.send_dm(
             user_id,
             f"A moderation action has been taken against you in {guild_name}.",
-            embed
-        )
\ No newline at end of file
+            embed,
+            view
+        )
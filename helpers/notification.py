@@ -1,7 +1,255 @@
 
 import discord
 import datetime
-from typing import Optional, Union
+import logging
+import time
+from types import MappingProxyType
+from typing import Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Emoji shown in front of the action description
+ACTION_EMOJI = MappingProxyType({
+    "ban": "🔨",
+    "kick": "👢", 
+    "timeout": "⏰",
+    "mute": "🔇",
+    "unmute": "🔊",
+    "voice_mute": "🎤❌",
+    "voice_unmute": "🎤✅",
+    "voice_deafen": "🔇❌",
+    "voice_undeafen": "🔇✅",
+    "warning": "⚠️"
+})
+
+# Embed colors per action type
+ACTION_COLORS = MappingProxyType({
+    "ban": 0xFF0000,  # Red
+    "kick": 0xFFA500,  # Orange
+    "timeout": 0xFFFF00,  # Yellow
+    "mute": 0xFFA500,  # Orange
+    "unmute": 0x00FF00,  # Green
+    "voice_mute": 0xFFA500,  # Orange
+    "voice_unmute": 0x00FF00,  # Green
+    "voice_deafen": 0xFFA500,  # Orange
+    "voice_undeafen": 0x00FF00,  # Green
+    "warning": 0xFFFF00  # Yellow
+})
+DEFAULT_ACTION_COLOR = 0x7289DA  # Discord blue
+
+# Descriptions for actions that don't depend on a duration
+ACTION_DESCRIPTIONS = MappingProxyType({
+    "kick": "You have been **kicked** from the server",
+    "voice_mute": "You have been **muted** in voice channels",
+    "voice_unmute": "You have been **unmuted** in voice channels",
+    "voice_deafen": "You have been **deafened** in voice channels",
+    "voice_undeafen": "You have been **undeafened** in voice channels",
+})
+
+# Actions whose DM includes when they end
+TIMED_ACTIONS = frozenset(("timeout", "ban", "mute"))
+
+def _ban_description(emoji: str, duration: Optional[int]) -> str:
+    if duration and duration > 0:
+        return f"{emoji} You have been **banned** for {format_duration(duration)}"
+    return f"{emoji} You have been **permanently banned**"
+
+def _timeout_description(emoji: str, duration: Optional[int]) -> str:
+    if duration and duration > 0:
+        return f"{emoji} You have been **timed out** for {format_duration(duration)}"
+    return f"{emoji} You have been **timed out**"
+
+# Description builders for actions whose text depends on the duration
+DESCRIPTION_BUILDERS = MappingProxyType({
+    "ban": _ban_description,
+    "timeout": _timeout_description,
+    "mute": _timeout_description,
+})
+
+class ModeratorResponse(discord.ui.View):
+    """Approve/deny buttons sent to the moderator along with an appeal"""
+    def __init__(self, mod_id: int, action_type: str, target_user: Union[discord.Member, discord.User],
+                 appellant: Union[discord.Member, discord.User]):
+        super().__init__(timeout=None)
+        self.mod_id = mod_id
+        self.action_type = action_type
+        self.target_user = target_user
+        self.appellant = appellant
+
+    @discord.ui.button(label="Approve Appeal", style=discord.ButtonStyle.success)
+    async def approve(self, btn_interaction: discord.Interaction, button: discord.ui.Button):
+        if btn_interaction.user.id != self.mod_id:
+            await btn_interaction.response.send_message("You cannot respond to this appeal.", ephemeral=True)
+            return
+
+        # Undo the moderation action
+        if self.action_type == "timeout":
+            await self.target_user.timeout(None, reason="Appeal approved")
+        elif self.action_type == "voice_mute":
+            await self.target_user.edit(mute=False, reason="Appeal approved")
+        elif self.action_type == "voice_deafen":
+            await self.target_user.edit(deafen=False, reason="Appeal approved")
+
+        await btn_interaction.response.send_message(f"Appeal approved for {self.appellant.mention}")
+        await self.appellant.send("Your appeal has been approved! The moderation action has been reversed.")
+        self.disable_all_buttons()
+        await btn_interaction.message.edit(view=self)
+
+    @discord.ui.button(label="Deny Appeal", style=discord.ButtonStyle.danger)
+    async def deny(self, btn_interaction: discord.Interaction, button: discord.ui.Button):
+        if btn_interaction.user.id != self.mod_id:
+            await btn_interaction.response.send_message("You cannot respond to this appeal.", ephemeral=True)
+            return
+
+        await btn_interaction.response.send_message(f"Appeal denied for {self.appellant.mention}")
+        await self.appellant.send("Your appeal has been denied.")
+        self.disable_all_buttons()
+        await btn_interaction.message.edit(view=self)
+
+    def disable_all_buttons(self):
+        for child in self.children:
+            child.disabled = True
+
+class AppealModal(discord.ui.Modal):
+    """Modal asking the user why a moderation action should be reversed"""
+    def __init__(self, mod_id: int, action_type: str, target_user: Union[discord.Member, discord.User],
+                 appellant: Union[discord.Member, discord.User], client: discord.Client):
+        super().__init__(title="Submit Appeal")
+        self.mod_id = mod_id
+        self.action_type = action_type
+        self.target_user = target_user
+        self.appellant = appellant
+        self.client = client
+        self.appeal_text = discord.ui.TextInput(
+            label="Why should this action be reversed?",
+            style=discord.TextStyle.paragraph,
+            max_length=1000
+        )
+        self.add_item(self.appeal_text)
+
+    async def on_submit(self, modal_interaction: discord.Interaction):
+        # Send appeal to moderator
+        try:
+            # Moderators are usually in the gateway cache, only hit the API on a miss
+            mod = self.client.get_user(self.mod_id) or await self.client.fetch_user(self.mod_id)
+            appeal_embed = discord.Embed(
+                title="Moderation Appeal",
+                description=f"Appeal from {self.appellant.mention}",
+                color=0xFFA500
+            )
+            appeal_embed.add_field(name="Appeal Text", value=self.appeal_text.value)
+
+            view = ModeratorResponse(self.mod_id, self.action_type, self.target_user, self.appellant)
+            await mod.send(embed=appeal_embed, view=view)
+            await modal_interaction.response.send_message("Your appeal has been submitted!", ephemeral=True)
+        except Exception as e:
+            logger.warning("Error sending appeal: %s", e, exc_info=True)
+            await modal_interaction.response.send_message("Error submitting appeal. Please try again later.", ephemeral=True)
+
+class AppealButton(discord.ui.View):
+    """Appeal button attached to moderation DMs"""
+    def __init__(self, mod_id: int, action_type: str, target_user: Union[discord.Member, discord.User]):
+        super().__init__(timeout=None)
+        self.mod_id = mod_id
+        self.action_type = action_type
+        self.target_user = target_user
+
+    @discord.ui.button(label="Request Appeal", style=discord.ButtonStyle.primary)
+    async def appeal_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        # Create modal for appeal text
+        modal = AppealModal(self.mod_id, self.action_type, self.target_user, interaction.user, interaction.client)
+        await interaction.response.send_modal(modal)
+
+def build_moderation_dm(
+    user: Optional[Union[discord.Member, discord.User]],
+    action_type: str,
+    guild_name: str,
+    reason: str,
+    duration: Optional[int] = None,
+    moderator_name: Optional[str] = None,
+    guild: Optional[discord.Guild] = None,
+    moderator: Optional[discord.Member] = None,
+    moderator_id: Optional[int] = None
+) -> Tuple[discord.Embed, Optional[discord.ui.View]]:
+    """
+    Build the embed and appeal view for a moderation action DM
+    
+    Args:
+        user: The user the action was taken against, None to leave out the appeal button
+        action_type: The type of moderation action (ban, kick, timeout, etc.)
+        guild_name: The name of the server where the action occurred
+        reason: The reason for the moderation action
+        duration: Duration in seconds (for timeout, temporary ban)
+        moderator_name: Name of the moderator who took the action
+        guild: The server where the action occurred
+        moderator: The moderator who took the action
+        moderator_id: ID of the moderator, used when the moderator object isn't available
+    
+    Returns:
+        The embed and the appeal view, the view is None when there is no moderator to appeal to
+    """
+    at = action_type.lower()
+    
+    # Create embed
+    embed = discord.Embed(color=ACTION_COLORS.get(at, DEFAULT_ACTION_COLOR))
+    
+    # Set author with server icon if available
+    if guild and guild.icon:
+        embed.set_author(name=f"Moderation Action in {guild_name}", icon_url=guild.icon.url)
+    else:
+        embed.set_author(name=f"Moderation Action in {guild_name}")
+
+    # Set thumbnail to moderator's avatar if available  
+    if moderator and moderator.avatar:
+        embed.set_thumbnail(url=moderator.avatar.url)
+
+    emoji = ACTION_EMOJI.get(at, "📝")
+    
+    # Create action description
+    if at in DESCRIPTION_BUILDERS:
+        description = DESCRIPTION_BUILDERS[at](emoji, duration)
+    elif at in ACTION_DESCRIPTIONS:
+        description = f"{emoji} {ACTION_DESCRIPTIONS[at]}"
+    else:
+        description = f"{emoji} Action: **{action_type}**"
+
+    embed.description = description
+
+    # Add fields
+    embed.add_field(name="📝 Reason", value=reason or "No reason provided", inline=False)
+    
+    if moderator_name:
+        embed.add_field(name="👤 Moderator", value=moderator_name, inline=True)
+
+    if duration and at in TIMED_ACTIONS:
+        end_ts = int(time.time() + duration)
+        embed.add_field(
+            name="⏳ Duration", 
+            value=f"Ends <t:{end_ts}:R>",
+            inline=True
+        )
+
+    # Add server info
+    if guild:
+        member_count = guild.member_count or 0
+        embed.add_field(
+            name="🏠 Server Info",
+            value=f"Members: {member_count:,}\nID: {guild.id}",
+            inline=True
+        )
+
+    # Appeals are sent to the moderator, so there is nothing to appeal to without one
+    mod_id = moderator.id if moderator else moderator_id
+    view = AppealButton(mod_id, action_type, user) if mod_id and user else None
+
+    # Set footer
+    if view:
+        embed.set_footer(text="If you believe this was a mistake, use the Appeal button below")
+    else:
+        embed.set_footer(text="If you believe this was a mistake, please contact a server administrator.")
+    embed.timestamp = datetime.datetime.now(datetime.timezone.utc)
+
+    return embed, view
 
 async def send_moderation_dm(
     user: Union[discord.Member, discord.User],
@@ -29,213 +277,33 @@ async def send_moderation_dm(
         bool: True if the message was sent successfully, False otherwise
     """
     try:
-        # Create embed
-        embed = discord.Embed(color=get_action_color(action_type))
-        
-        # Set author with server icon if available
-        if guild and guild.icon:
-            embed.set_author(name=f"Moderation Action in {guild_name}", icon_url=guild.icon.url)
-        else:
-            embed.set_author(name=f"Moderation Action in {guild_name}")
-
-        # Set thumbnail to moderator's avatar if available  
-        if moderator and moderator.avatar:
-            embed.set_thumbnail(url=moderator.avatar.url)
-
-        # Format action title with emojis
-        action_emoji = {
-            "ban": "🔨",
-            "kick": "👢", 
-            "timeout": "⏰",
-            "mute": "🔇",
-            "unmute": "🔊",
-            "voice_mute": "🎤❌",
-            "voice_unmute": "🎤✅",
-            "voice_deafen": "🔇❌",
-            "voice_undeafen": "🔇✅",
-            "warning": "⚠️"
-        }
-
-        emoji = action_emoji.get(action_type.lower(), "📝")
+        embed, view = build_moderation_dm(
+            user, action_type, guild_name, reason, duration=duration, moderator_name=moderator_name,
+            guild=guild, moderator=moderator, moderator_id=moderator_id
+        )
         
-        # Create action description
-        if action_type.lower() == "ban":
-            if duration and duration > 0:
-                duration_str = format_duration(duration)
-                description = f"{emoji} You have been **banned** for {duration_str}"
-            else:
-                description = f"{emoji} You have been **permanently banned**"
-                
-        elif action_type.lower() == "kick":
-            description = f"{emoji} You have been **kicked** from the server"
-            
-        elif action_type.lower() == "timeout" or action_type.lower() == "mute":
-            if duration and duration > 0:
-                duration_str = format_duration(duration)
-                description = f"{emoji} You have been **timed out** for {duration_str}"
-            else:
-                description = f"{emoji} You have been **timed out**"
-                
-        elif action_type.lower() == "voice_mute":
-            description = f"{emoji} You have been **muted** in voice channels"
-            
-        elif action_type.lower() == "voice_unmute":
-            description = f"{emoji} You have been **unmuted** in voice channels"
-            
-        elif action_type.lower() == "voice_deafen":
-            description = f"{emoji} You have been **deafened** in voice channels"
-            
-        elif action_type.lower() == "voice_undeafen":
-            description = f"{emoji} You have been **undeafened** in voice channels"
-            
-        else:
-            description = f"{emoji} Action: **{action_type}**"
-
-        embed.description = description
-
-        # Add fields
-        embed.add_field(name="📝 Reason", value=reason or "No reason provided", inline=False)
-        
-        if moderator_name:
-            embed.add_field(name="👤 Moderator", value=moderator_name, inline=True)
-
-        if duration and action_type.lower() in ["timeout", "ban", "mute"]:
-            end_time = datetime.datetime.utcnow() + datetime.timedelta(seconds=duration)
-            embed.add_field(
-                name="⏳ Duration", 
-                value=f"Ends <t:{int(end_time.timestamp())}:R>",
-                inline=True
-            )
-
-        # Add server info
-        if guild:
-            member_count = guild.member_count or 0
-            embed.add_field(
-                name="🏠 Server Info",
-                value=f"Members: {member_count:,}\nID: {guild.id}",
-                inline=True
-            )
-
-        # Set footer
-        embed.set_footer(text="If you believe this was a mistake, use the Appeal button below")
-        embed.timestamp = datetime.datetime.utcnow()
-
-        # Create appeal button
-        class AppealButton(discord.ui.View):
-            def __init__(self, mod_id: int):
-                super().__init__(timeout=None)
-                self.mod_id = mod_id
-
-            @discord.ui.button(label="Request Appeal", style=discord.ButtonStyle.primary)
-            async def appeal_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-                # Create modal for appeal text
-                class AppealModal(discord.ui.Modal):
-                    def __init__(self, mod_id):
-                        super().__init__(title="Submit Appeal")
-                        self.mod_id = mod_id
-                        self.appeal_text = discord.ui.TextInput(
-                            label="Why should this action be reversed?",
-                            style=discord.TextStyle.paragraph,
-                            max_length=1000
-                        )
-                        self.add_item(self.appeal_text)
-
-                    async def on_submit(self, modal_interaction: discord.Interaction):
-                        # Send appeal to moderator
-                        try:
-                            mod = await interaction.client.fetch_user(self.mod_id)
-                            appeal_embed = discord.Embed(
-                                title="Moderation Appeal",
-                                description=f"Appeal from {interaction.user.mention}",
-                                color=0xFFA500
-                            )
-                            appeal_embed.add_field(name="Appeal Text", value=self.appeal_text.value)
-                            
-                            # Create approve/deny buttons
-                            class ModeratorResponse(discord.ui.View):
-                                def __init__(self, mod_id):
-                                    super().__init__(timeout=None)
-                                    self.mod_id = mod_id
-
-                                @discord.ui.button(label="Approve Appeal", style=discord.ButtonStyle.success)
-                                async def approve(self, btn_interaction: discord.Interaction, button: discord.ui.Button):
-                                    if btn_interaction.user.id != self.mod_id:
-                                        await btn_interaction.response.send_message("You cannot respond to this appeal.", ephemeral=True)
-                                        return
-
-                                    # Undo the moderation action
-                                    if action_type == "timeout":
-                                        await user.timeout(None, reason="Appeal approved")
-                                    elif action_type == "voice_mute":
-                                        await user.edit(mute=False, reason="Appeal approved")
-                                    elif action_type == "voice_deafen":
-                                        await user.edit(deafen=False, reason="Appeal approved")
-
-                                    await btn_interaction.response.send_message(f"Appeal approved for {interaction.user.mention}")
-                                    await interaction.user.send("Your appeal has been approved! The moderation action has been reversed.")
-                                    self.disable_all_buttons()
-                                    await btn_interaction.message.edit(view=self)
-
-                                @discord.ui.button(label="Deny Appeal", style=discord.ButtonStyle.danger)
-                                async def deny(self, btn_interaction: discord.Interaction, button: discord.ui.Button):
-                                    if btn_interaction.user.id != self.mod_id:
-                                        await btn_interaction.response.send_message("You cannot respond to this appeal.", ephemeral=True)
-                                        return
-
-                                    await btn_interaction.response.send_message(f"Appeal denied for {interaction.user.mention}")
-                                    await interaction.user.send("Your appeal has been denied.")
-                                    self.disable_all_buttons()
-                                    await btn_interaction.message.edit(view=self)
-
-                                def disable_all_buttons(self):
-                                    for child in self.children:
-                                        child.disabled = True
-
-                            await mod.send(embed=appeal_embed, view=ModeratorResponse(self.mod_id))
-                            await modal_interaction.response.send_message("Your appeal has been submitted!", ephemeral=True)
-                        except Exception as e:
-                            print(f"Error sending appeal: {e}")
-                            await modal_interaction.response.send_message("Error submitting appeal. Please try again later.", ephemeral=True)
-
-                await interaction.response.send_modal(AppealModal(self.mod_id))
-
         # Send the embed with appeal button
         try:
-            await user.send(embed=embed, view=AppealButton(moderator.id if moderator else None))
+            await user.send(embed=embed, view=view)
             return True
         except discord.Forbidden:
             return False
             
     except Exception as e:
-        print(f"Error sending DM to {user}: {e}")
+        logger.warning("Error sending DM to %s: %s", user, e, exc_info=True)
         return False
 
 def get_action_color(action_type: str) -> int:
     """Get the appropriate color for the action type"""
-    colors = {
-        "ban": 0xFF0000,  # Red
-        "kick": 0xFFA500,  # Orange
-        "timeout": 0xFFFF00,  # Yellow
-        "mute": 0xFFA500,  # Orange
-        "unmute": 0x00FF00,  # Green
-        "voice_mute": 0xFFA500,  # Orange
-        "voice_unmute": 0x00FF00,  # Green
-        "voice_deafen": 0xFFA500,  # Orange
-        "voice_undeafen": 0x00FF00,  # Green
-        "warning": 0xFFFF00  # Yellow
-    }
-    return colors.get(action_type.lower(), 0x7289DA)  # Default to Discord blue
+    return ACTION_COLORS.get(action_type.lower(), DEFAULT_ACTION_COLOR)
+
+# Duration units from largest to smallest as (seconds, name)
+_UNITS = ((86400, "day"), (3600, "hour"), (60, "minute"), (1, "second"))
 
 def format_duration(seconds: int) -> str:
     """Format a duration in seconds to a human-readable string"""
-    if seconds < 60:
-        return f"{seconds} second{'s' if seconds != 1 else ''}"
-    elif seconds < 3600:
-        minutes = seconds // 60
-        return f"{minutes} minute{'s' if minutes != 1 else ''}"
-    elif seconds < 86400:
-        hours = seconds // 3600
-        return f"{hours} hour{'s' if hours != 1 else ''}"
-    else:
-        days = seconds // 86400
-        return f"{days} day{'s' if days != 1 else ''}"
+    for size, name in _UNITS:
+        if seconds >= size:
+            count = seconds // size
+            return f"{count} {name}{'' if count == 1 else 's'}"
+    return "0 seconds"
@@ -1,15 +1,24 @@
 import os
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from threading import Thread
 from simple_web import app  # Import the app object for gunicorn
 from bot_helpers import set_bot_instance
 
 # Configure minimal logging - only show important messages
+# Records are handed to a background listener thread so logging calls never block on stdout
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, logging.StreamHandler())
 logging.basicConfig(
     level=logging.INFO,
     format='%(message)s',
-    handlers=[logging.StreamHandler()]
+    handlers=[QueueHandler(log_queue)],
+    force=True
 )
+log_listener.start()
+atexit.register(log_listener.stop)
 
 # Silence verbose loggers
 for logger_name in ['werkzeug', 'discord', 'urllib3', 'asyncio', 'urllib3.connectionpool']:
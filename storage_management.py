@@ -4,7 +4,7 @@ import time
 import datetime
 from typing import Union, Dict, Any, List, Optional
 
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
 
 
 class JsonFileManager:
@@ -376,17 +376,18 @@ class MongoDBManager:
         
     # === User Profile Management ===
     
-    async def get_user_profile(self, user_id: str) -> Optional[Dict[str, Any]]:
+    async def get_user_profile(self, user_id: str, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """Get a user's profile from MongoDB
         
         Args:
             user_id: The Discord user ID
+            projection: Optional MongoDB projection to only fetch some fields
             
         Returns:
             The user profile data if found, None otherwise
         """
         user_id = str(user_id)
-        return self.user_profiles.find_one({"_id": user_id})
+        return self.user_profiles.find_one({"_id": user_id}, projection)
         
     async def create_user_profile(self, user_id: str, username: str, avatar_url: str = None) -> Dict[str, Any]:
         """Create a new user profile in MongoDB
@@ -478,6 +479,28 @@ class MongoDBManager:
             }
         )
         
+    async def increment_user_stats_bulk(self, increments: List[tuple]) -> None:
+        """Increment many user statistics with a single MongoDB bulk write
+        
+        Args:
+            increments: List of (user_id, stat_name, amount) tuples
+        """
+        if not increments:
+            return
+            
+        now = datetime.datetime.utcnow()
+        operations = [
+            UpdateOne(
+                {"_id": str(user_id)},
+                {
+                    "$inc": {f"stats.{stat_name}": amount},
+                    "$set": {"stats.last_active": now, "updated_at": now}
+                }
+            )
+            for user_id, stat_name, amount in increments
+        ]
+        self.user_profiles.bulk_write(operations, ordered=False)
+        
     async def add_user_badge(self, user_id: str, badge_name: str, badge_icon: str = None) -> None:
         """Add a badge to a user's profile
         